@@ -1,885 +1,1527 @@
-import os, subprocess, yt_dlp, cv2, tempfile, time, sys, csv, shutil
-from datetime import timedelta
-import mediapipe as mp
-from rich.console import Console
-from rich.panel import Panel
-from rich.align import Align
-from rich.table import Table
-from rich.progress import Progress
-from rich.text import Text
-import numpy as np
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-import plotly.express as px
-from scipy import stats
-import math
-
-# --- Setup paths ---
-# Get script directory for relative paths
-script_dir = os.path.dirname(os.path.abspath(__file__))
-
-# Create folders relative to script location
-video_folder = os.path.join(script_dir, "videos")
-tracked_folder = os.path.join(script_dir, "tracked") 
-csv_folder = os.path.join(script_dir, "csv_data")
-reports_folder = os.path.join(script_dir, "reports")
-cache_file = os.path.join(script_dir, "url_cache.txt")
-
-# Create required folders
-for folder in [video_folder, tracked_folder, csv_folder, reports_folder]:
-    os.makedirs(folder, exist_ok=True)
-
-# Find FFmpeg executables in PATH
-ffmpeg_path = shutil.which("ffmpeg") or "ffmpeg.exe"
-ffplay_path = shutil.which("ffplay") or "ffplay.exe"
-
-# --- Rich console ---
-console = Console()
-ascii_title = r"""
-                 _ _         ___ _                                    _ _____                _    _             
-  /\/\   ___  __| (_) __ _  / _ (_)_ __   ___    /\  /\__ _ _ __   __| /__   \_ __ __ _  ___| | _(_)_ __   __ _ 
- /    \ / _ \/ _` | |/ _` |/ /_)/ | '_ \ / _ \  / /_/ / _` | '_ \ / _` | / /\/ '__/ _` |/ __| |/ / | '_ \ / _` |
-/ /\/\ \  __/ (_| | | (_| / ___/| | |_) |  __/ / __  / (_| | | | | (_| |/ /  | | | (_| | (__|   <| | | | | (_| |
-\/    \/\___|\__,_|_|\__,_\/    |_| .__/ \___| \/ /_/ \__,_|_| |_|\__,_|\/   |_|  \__,_|\___|_|\_\_|_| |_|\__, |
-                                  |_|                                                                     |___/ 
-"""
-for i in range(6):
-    console.clear()
-    border = "bold bright_blue" if i % 2 == 0 else "bold white"
-    console.print(Panel(Align.center(ascii_title, vertical="middle"), border_style=border, expand=True))
-    time.sleep(0.5)
-console.clear()
-
-# --- URL Cache ---
-url_cache = {}
-if os.path.exists(cache_file):
-    with open(cache_file, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                url, filename = line.split("|||")
-                url_cache[url] = filename
-
-# --- Helper functions ---
-def list_existing_videos():
-    return [f for f in os.listdir(video_folder) if f.lower().endswith(".mp4")]
-
-def get_video_info(video_path):
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        return "Unable to open"
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    duration_sec = frame_count / fps if fps else 0
-    cap.release()
-    return f"{str(timedelta(seconds=int(duration_sec)))} | {width}x{height} | {fps:.2f} FPS"
-
-def clean_old_csv_files(base_name):
-    """Delete all existing CSV files for the same video"""
-    deleted_count = 0
-    csv_files_found = []
-    
-    # Find all CSV files that match this video
-    for f in os.listdir(csv_folder):
-        if f.startswith(base_name) and f.endswith("_hand_data.csv"):
-            csv_files_found.append(f)
-    
-    # Delete found CSV files
-    for csv_file in csv_files_found:
-        try:
-            os.remove(os.path.join(csv_folder, csv_file))
-            deleted_count += 1
-            console.print(f"[yellow]Deleted old CSV:[/yellow] {csv_file}")
-        except Exception as e:
-            console.print(f"[red]Could not delete CSV {csv_file}: {e}[/red]")
-    
-    if deleted_count > 0:
-        console.print(f"[green]Cleaned up {deleted_count} old CSV file(s) for {base_name}[/green]")
-    elif csv_files_found:
-        console.print(f"[red]Found {len(csv_files_found)} old CSV file(s) but could not delete them[/red]")
-    
-    return deleted_count
-
-def clean_old_report_files(base_name):
-    """Delete all existing report files for the same video"""
-    deleted_count = 0
-    report_files_found = []
-    
-    # File patterns to look for
-    patterns = [
-        f"{base_name}_3d_trajectory.html",
-        f"{base_name}_tracking_report.txt"
-    ]
-    
-    # Find all report files that match this video
-    for f in os.listdir(reports_folder):
-        for pattern in patterns:
-            if f == pattern:
-                report_files_found.append(f)
-                break
-    
-    # Delete found report files
-    for report_file in report_files_found:
-        try:
-            os.remove(os.path.join(reports_folder, report_file))
-            deleted_count += 1
-            console.print(f"[yellow]Deleted old report:[/yellow] {report_file}")
-        except Exception as e:
-            console.print(f"[red]Could not delete report {report_file}: {e}[/red]")
-    
-    if deleted_count > 0:
-        console.print(f"[green]Cleaned up {deleted_count} old report file(s) for {base_name}[/green]")
-    elif report_files_found:
-        console.print(f"[red]Found {len(report_files_found)} old report file(s) but could not delete them[/red]")
-    
-    return deleted_count
-
-def create_ascii_heatmap(csv_data, width, height, base_name):
-    """Create enhanced ASCII heatmap for CLI display"""
-    console.print("\n" + "="*80)
-    console.print(Panel(
-        Align.center(f"[bold cyan]HAND MOVEMENT HEATMAP[/bold cyan]\n[dim]{base_name}[/dim]", 
-                     vertical="middle"), 
-        border_style="bold cyan", 
-        expand=True
-    ))
-    
-    if not csv_data:
-        console.print("[red]No tracking data available for heatmap[/red]")
-        return
-    
-    # Create 2D grid for heatmap (increased resolution for better clarity)
-    grid_width, grid_height = 80, 25
-    heatmap = np.zeros((grid_height, grid_width))
-    
-    # Separate data by hand for better analysis
-    left_data = [d for d in csv_data if d['hand'] == 'Left']
-    right_data = [d for d in csv_data if d['hand'] == 'Right']
-    
-    # Process tracking data
-    for entry in csv_data:
-        # Convert normalized coordinates to grid positions
-        grid_x = int(entry['wrist_x'] * (grid_width - 1))
-        grid_y = int(entry['wrist_y'] * (grid_height - 1))
-        
-        # Ensure within bounds
-        grid_x = max(0, min(grid_width - 1, grid_x))
-        grid_y = max(0, min(grid_height - 1, grid_y))
-        
-        # Weight by hand type for better visualization
-        weight = 1.5 if entry['hand'] == 'Right' else 1.0
-        heatmap[grid_y][grid_x] += weight
-    
-    # Normalize heatmap
-    if heatmap.max() > 0:
-        heatmap = heatmap / heatmap.max()
-    
-    # Enhanced ASCII visualization with better contrast
-    chars = [' ', '·', '░', '▒', '▓', '█']
-    colors = ['black', 'dim blue', 'blue', 'cyan', 'yellow', 'red']
-    
-    # Add border
-    console.print("┌" + "─" * grid_width + "┐")
-    
-    for i, row in enumerate(heatmap):
-        line_chars = []
-        for val in row:
-            char_idx = int(val * (len(chars) - 1))
-            char = chars[char_idx]
-            color = colors[char_idx]
-            line_chars.append(f"[{color}]{char}[/{color}]")
-        
-        # Add row indicators for orientation
-        if i == 0:
-            console.print(f"│{''.join(line_chars)}│ [dim]← Top[/dim]")
-        elif i == len(heatmap) - 1:
-            console.print(f"│{''.join(line_chars)}│ [dim]← Bottom[/dim]")
-        elif i == len(heatmap) // 2:
-            console.print(f"│{''.join(line_chars)}│ [dim]← Center[/dim]")
-        else:
-            console.print(f"│{''.join(line_chars)}│")
-    
-    console.print("└" + "─" * grid_width + "┘")
-    
-    # Enhanced legend and statistics
-    legend_table = Table(show_header=False, box=None, padding=(0, 1))
-    legend_table.add_column("Symbol", style="bold")
-    legend_table.add_column("Intensity", style="dim")
-    legend_table.add_column("Color", style="bold")
-    
-    legend_items = [
-        (" ", "No Activity", "black"),
-        ("·", "Minimal", "dim blue"), 
-        ("░", "Low", "blue"),
-        ("▒", "Medium", "cyan"),
-        ("▓", "High", "yellow"),
-        ("█", "Very High", "red")
-    ]
-    
-    for symbol, intensity, color in legend_items:
-        legend_table.add_row(
-            f"[{color}]{symbol}[/{color}]",
-            intensity,
-            color.title()
-        )
-    
-    console.print("\n[bold]Legend:[/bold]")
-    console.print(legend_table)
-    
-    # Statistics summary
-    stats_table = Table(title="Movement Statistics", show_header=True, header_style="bold magenta")
-    stats_table.add_column("Metric", style="cyan")
-    stats_table.add_column("Value", style="white")
-    
-    total_detections = len(csv_data)
-    left_detections = len(left_data)
-    right_detections = len(right_data)
-    coverage = np.count_nonzero(heatmap) / heatmap.size * 100
-    
-    stats_table.add_row("Total Hand Detections", str(total_detections))
-    stats_table.add_row("Left Hand Detections", f"{left_detections} ({left_detections/total_detections*100:.1f}%)" if total_detections > 0 else "0")
-    stats_table.add_row("Right Hand Detections", f"{right_detections} ({right_detections/total_detections*100:.1f}%)" if total_detections > 0 else "0")
-    stats_table.add_row("Screen Coverage", f"{coverage:.1f}%")
-    stats_table.add_row("Grid Resolution", f"{width} × {height}")
-    stats_table.add_row("Video Resolution", f"{width} × {height}")
-    
-    console.print("\n")
-    console.print(stats_table)
-    console.print("="*80)
-
-def create_3d_trajectory(csv_data, base_name):
-    """Create user-friendly 3D trajectory visualization using Plotly"""
-    if not csv_data:
-        console.print("[red]No tracking data available for 3D trajectory[/red]")
-        return
-    
-    console.print("[green]Generating 3D trajectory visualization...[/green]")
-    
-    # Separate data by hand
-    left_data = [d for d in csv_data if d['hand'] == 'Left']
-    right_data = [d for d in csv_data if d['hand'] == 'Right']
-    
-    fig = go.Figure()
-    
-    # Add left hand trajectory
-    if left_data:
-        left_data.sort(key=lambda x: x['frame'])  # Sort by frame
-        x_left = [d['wrist_x'] for d in left_data]
-        y_left = [d['wrist_y'] for d in left_data]
-        z_left = [d['wrist_z'] for d in left_data]
-        frames_left = [d['frame'] for d in left_data]
-        
-        fig.add_trace(go.Scatter3d(
-            x=x_left, y=y_left, z=z_left,
-            mode='lines+markers',
-            marker=dict(size=4, color=frames_left, colorscale='Reds', 
-                       showscale=True, colorbar=dict(title="Video Frame", x=1.15)),
-            line=dict(color='red', width=6),
-            name='Left Hand Path',
-            hovertemplate='<b>Left Hand</b><br>' +
-                         'Horizontal: %{x:.3f}<br>' +
-                         'Vertical: %{y:.3f}<br>' +
-                         'Depth: %{z:.3f}<br>' +
-                         'Frame: %{marker.color}<br>' +
-                         '<i>Red line shows left hand movement</i><extra></extra>'
-        ))
-    
-    # Add right hand trajectory
-    if right_data:
-        right_data.sort(key=lambda x: x['frame'])  # Sort by frame
-        x_right = [d['wrist_x'] for d in right_data]
-        y_right = [d['wrist_y'] for d in right_data]
-        z_right = [d['wrist_z'] for d in right_data]
-        frames_right = [d['frame'] for d in right_data]
-        
-        fig.add_trace(go.Scatter3d(
-            x=x_right, y=y_right, z=z_right,
-            mode='lines+markers',
-            marker=dict(size=4, color=frames_right, colorscale='Blues', 
-                       showscale=True, colorbar=dict(title="Video Frame", x=1.25)),
-            line=dict(color='blue', width=6),
-            name='Right Hand Path',
-            hovertemplate='<b>Right Hand</b><br>' +
-                         'Horizontal: %{x:.3f}<br>' +
-                         'Vertical: %{y:.3f}<br>' +
-                         'Depth: %{z:.3f}<br>' +
-                         'Frame: %{marker.color}<br>' +
-                         '<i>Blue line shows right hand movement</i><extra></extra>'
-        ))
-    
-    # Add starting points for clarity
-    if left_data:
-        fig.add_trace(go.Scatter3d(
-            x=[x_left[0]], y=[y_left[0]], z=[z_left[0]],
-            mode='markers',
-            marker=dict(size=12, color='darkred', symbol='diamond'),
-            name='Left Hand Start',
-            hovertemplate='<b>Left Hand Starting Point</b><br>Frame: %{text}<extra></extra>',
-            text=[frames_left[0]]
-        ))
-    
-    if right_data:
-        fig.add_trace(go.Scatter3d(
-            x=[x_right[0]], y=[y_right[0]], z=[z_right[0]],
-            mode='markers',
-            marker=dict(size=12, color='darkblue', symbol='diamond'),
-            name='Right Hand Start',
-            hovertemplate='<b>Right Hand Starting Point</b><br>Frame: %{text}<extra></extra>',
-            text=[frames_right[0]]
-        ))
-    
-    # Create comprehensive title and annotations
-    total_frames = max([d['frame'] for d in csv_data]) if csv_data else 0
-    left_count = len(left_data)
-    right_count = len(right_data)
-    
-    title_text = f"<b>Hand Movement Analysis: {base_name}</b><br>" + \
-                f"<span style='font-size: 14px;'>Left Hand: {left_count} detections | " + \
-                f"Right Hand: {right_count} detections | Total Frames: {total_frames}</span>"
-    
-    # Customize layout with detailed explanations
-    fig.update_layout(
-        title=dict(
-            text=title_text,
-            x=0.5,
-            font=dict(size=18)
-        ),
-        scene=dict(
-            xaxis_title='<b>Horizontal Position</b><br><i>(0 = Left Edge, 1 = Right Edge)</i>',
-            yaxis_title='<b>Vertical Position</b><br><i>(0 = Top Edge, 1 = Bottom Edge)</i>',
-            zaxis_title='<b>Depth Position</b><br><i>(Closer to camera = Larger values)</i>',
-            bgcolor='rgba(240,240,240,0.9)',
-            xaxis=dict(gridcolor='gray', range=[0, 1], dtick=0.2),
-            yaxis=dict(gridcolor='gray', range=[0, 1], dtick=0.2),
-            zaxis=dict(gridcolor='gray'),
-            camera=dict(
-                eye=dict(x=1.5, y=1.5, z=1.5),  # Better default viewing angle
-                up=dict(x=0, y=0, z=1)
-            )
-        ),
-        font=dict(size=12),
-        showlegend=True,
-        legend=dict(
-            yanchor="top",
-            y=0.99,
-            xanchor="left",
-            x=0.01,
-            bgcolor="rgba(255,255,255,0.8)"
-        ),
-        annotations=[
-            dict(
-                text="<b>How to Read This Graph:</b><br>" +
-                     "• Red lines = Left hand movement path<br>" +
-                     "• Blue lines = Right hand movement path<br>" +
-                     "• Diamonds = Starting positions<br>" +
-                     "• Darker colors = Earlier in video<br>" +
-                     "• Lighter colors = Later in video<br>" +
-                     "• Use mouse to rotate and zoom",
-                showarrow=False,
-                xref="paper", yref="paper",
-                x=0.02, y=0.02,
-                xanchor="left", yanchor="bottom",
-                bgcolor="rgba(255,255,255,0.9)",
-                bordercolor="gray",
-                borderwidth=1,
-                font=dict(size=11)
-            )
-        ]
-    )
-    
-    # Save and show
-    trajectory_file = os.path.join(reports_folder, f"{base_name}_3d_trajectory.html")
-    fig.write_html(trajectory_file)
-    console.print(f"[green]3D trajectory saved:[/green] {trajectory_file}")
-    
-    # Auto-open in browser with user-friendly message
-    try:
-        import webbrowser
-        webbrowser.open(f'file://{os.path.abspath(trajectory_file)}')
-        console.print("[cyan]Opening interactive 3D hand movement visualization...[/cyan]")
-        console.print("[dim]Tip: Use your mouse to rotate, zoom, and explore the 3D space![/dim]")
-    except:
-        console.print("[yellow]Could not auto-open browser. Please open the HTML file manually.[/yellow]")
-
-def calculate_movement_stats(csv_data, fps):
-    """Calculate detailed movement statistics"""
-    if not csv_data:
-        return {}
-    
-    stats = {'left': {}, 'right': {}, 'combined': {}}
-    
-    for hand_type in ['Left', 'Right']:
-        hand_data = [d for d in csv_data if d['hand'] == hand_type]
-        if not hand_data:
-            continue
-        
-        # Sort by frame number to ensure correct order
-        hand_data.sort(key=lambda x: x['frame'])
-        
-        hand_key = hand_type.lower()
-        
-        # Basic counts
-        stats[hand_key]['total_detections'] = len(hand_data)
-        stats[hand_key]['frames_active'] = len(set(d['frame'] for d in hand_data))
-        
-        # Calculate distances and speeds
-        distances = []
-        speeds = []
-        
-        for i in range(1, len(hand_data)):
-            prev = hand_data[i-1]
-            curr = hand_data[i]
-            
-            # 3D distance between consecutive detections
-            dx = curr['wrist_x'] - prev['wrist_x']
-            dy = curr['wrist_y'] - prev['wrist_y']
-            dz = curr['wrist_z'] - prev['wrist_z']
-            
-            distance = math.sqrt(dx**2 + dy**2 + dz**2)
-            distances.append(distance)
-            
-            # Speed calculation (units per second)
-            frame_diff = curr['frame'] - prev['frame']
-            if frame_diff > 0 and fps > 0:
-                time_diff = frame_diff / fps  # Convert frame difference to time
-                speed = distance / time_diff
-                speeds.append(speed)
-        
-        # Store distance statistics
-        if distances:
-            stats[hand_key]['total_distance'] = sum(distances)
-            stats[hand_key]['avg_distance_per_frame'] = sum(distances) / len(distances)
-            stats[hand_key]['max_distance_per_frame'] = max(distances)
-            stats[hand_key]['min_distance_per_frame'] = min(distances)
-        else:
-            stats[hand_key]['total_distance'] = 0
-            stats[hand_key]['avg_distance_per_frame'] = 0
-            stats[hand_key]['max_distance_per_frame'] = 0
-            stats[hand_key]['min_distance_per_frame'] = 0
-        
-        # Store speed statistics
-        if speeds:
-            stats[hand_key]['avg_speed'] = sum(speeds) / len(speeds)
-            stats[hand_key]['max_speed'] = max(speeds)
-            stats[hand_key]['min_speed'] = min(speeds)
-            stats[hand_key]['speed_std'] = np.std(speeds) if len(speeds) > 1 else 0
-        else:
-            stats[hand_key]['avg_speed'] = 0
-            stats[hand_key]['max_speed'] = 0
-            stats[hand_key]['min_speed'] = 0
-            stats[hand_key]['speed_std'] = 0
-        
-        # Position statistics
-        x_positions = [d['wrist_x'] for d in hand_data]
-        y_positions = [d['wrist_y'] for d in hand_data]
-        z_positions = [d['wrist_z'] for d in hand_data]
-        
-        stats[hand_key]['position_ranges'] = {
-            'x_range': max(x_positions) - min(x_positions) if x_positions else 0,
-            'y_range': max(y_positions) - min(y_positions) if y_positions else 0,
-            'z_range': max(z_positions) - min(z_positions) if z_positions else 0,
-        }
-        
-        stats[hand_key]['center_of_mass'] = {
-            'x': sum(x_positions) / len(x_positions) if x_positions else 0,
-            'y': sum(y_positions) / len(y_positions) if y_positions else 0,
-            'z': sum(z_positions) / len(z_positions) if z_positions else 0
-        }
-    
-    # Combined statistics
-    all_data = csv_data
-    if all_data:
-        stats['combined']['total_detections'] = len(all_data)
-        stats['combined']['unique_frames'] = len(set(d['frame'] for d in all_data))
-        max_frame = max(d['frame'] for d in all_data)
-        stats['combined']['detection_rate'] = (stats['combined']['unique_frames'] / max_frame * 100) if max_frame > 0 else 0
-    
-    return stats
-
-def generate_tracking_report(csv_data, base_name, fps, duration_sec):
-    """Generate comprehensive tracking analysis report in CLI"""
-    console.print("\n[bold cyan]═══ TRACKING ANALYSIS REPORT ═══[/bold cyan]")
-    
-    if not csv_data:
-        console.print("[red]No tracking data available for report[/red]")
-        return
-    
-    # Calculate statistics
-    stats = calculate_movement_stats(csv_data, fps)
-    
-    # Video Information Section
-    report_table = Table(title="Video Information", show_header=True, header_style="bold magenta")
-    report_table.add_column("Property", style="cyan", width=20)
-    report_table.add_column("Value", style="white")
-    
-    report_table.add_row("Video Name", base_name)
-    report_table.add_row("Duration", f"{duration_sec:.2f} seconds")
-    report_table.add_row("FPS", f"{fps:.2f}")
-    report_table.add_row("Total Frames", f"{int(duration_sec * fps)}")
-    
-    console.print(report_table)
-    
-    # Detection Summary
-    detection_table = Table(title="Hand Detection Summary", show_header=True, header_style="bold magenta")
-    detection_table.add_column("Hand", style="cyan", width=15)
-    detection_table.add_column("Detections", style="green", width=12)
-    detection_table.add_column("Active Frames", style="yellow", width=15)
-    detection_table.add_column("Detection Rate", style="blue", width=15)
-    
-    total_frames = int(duration_sec * fps)
-    
-    for hand in ['left', 'right']:
-        if hand in stats and 'total_detections' in stats[hand]:
-            detections = stats[hand]['total_detections']
-            active_frames = stats[hand]['frames_active']
-            detection_rate = (active_frames / total_frames * 100) if total_frames > 0 else 0
-            
-            detection_table.add_row(
-                hand.title(),
-                str(detections),
-                str(active_frames),
-                f"{detection_rate:.1f}%"
-            )
-    
-    console.print(detection_table)
-    
-    # Movement Analysis
-    movement_table = Table(title="Movement Analysis", show_header=True, header_style="bold magenta")
-    movement_table.add_column("Metric", style="cyan", width=25)
-    movement_table.add_column("Left Hand", style="red", width=15)
-    movement_table.add_column("Right Hand", style="blue", width=15)
-    
-    metrics = [
-        ("Total Distance", "total_distance", ":.4f"),
-        ("Avg Speed (units/sec)", "avg_speed", ":.4f"),
-        ("Max Speed (units/sec)", "max_speed", ":.4f"),
-        ("Speed Variation (std)", "speed_std", ":.4f"),
-        ("X Movement Range", "position_ranges.x_range", ":.3f"),
-        ("Y Movement Range", "position_ranges.y_range", ":.3f"),
-        ("Z Movement Range", "position_ranges.z_range", ":.3f"),
-    ]
-    
-    for metric_name, metric_key, format_str in metrics:
-        left_val = "N/A"
-        right_val = "N/A"
-        
-        # Handle nested keys
-        if 'left' in stats:
-            try:
-                if '.' in metric_key:
-                    keys = metric_key.split('.')
-                    val = stats['left']
-                    for k in keys:
-                        val = val[k]
-                    left_val = format(val, format_str)
-                elif metric_key in stats['left']:
-                    left_val = format(stats['left'][metric_key], format_str)
-            except:
-                pass
-        
-        if 'right' in stats:
-            try:
-                if '.' in metric_key:
-                    keys = metric_key.split('.')
-                    val = stats['right']
-                    for k in keys:
-                        val = val[k]
-                    right_val = format(val, format_str)
-                elif metric_key in stats['right']:
-                    right_val = format(stats['right'][metric_key], format_str)
-            except:
-                pass
-        
-        movement_table.add_row(metric_name, left_val, right_val)
-    
-    console.print(movement_table)
-    
-    # Save detailed report to file
-    report_file = os.path.join(reports_folder, f"{base_name}_tracking_report.txt")
-    with open(report_file, 'w') as f:
-        f.write(f"HAND TRACKING ANALYSIS REPORT\n")
-        f.write(f"{'='*50}\n")
-        f.write(f"Video: {base_name}\n")
-        f.write(f"Duration: {duration_sec:.2f} seconds\n")
-        f.write(f"FPS: {fps:.2f}\n")
-        f.write(f"Total Frames: {int(duration_sec * fps)}\n\n")
-        
-        f.write("DETECTION SUMMARY:\n")
-        f.write("-" * 30 + "\n")
-        for hand in ['left', 'right']:
-            if hand in stats and 'total_detections' in stats[hand]:
-                f.write(f"{hand.title()} Hand:\n")
-                f.write(f"  - Total Detections: {stats[hand]['total_detections']}\n")
-                f.write(f"  - Active Frames: {stats[hand]['frames_active']}\n")
-                f.write(f"  - Detection Rate: {stats[hand]['frames_active']/total_frames*100:.1f}%\n")
-        
-        f.write("\nMOVEMENT ANALYSIS:\n")
-        f.write("-" * 30 + "\n")
-        for hand in ['left', 'right']:
-            if hand in stats and 'total_distance' in stats[hand]:
-                f.write(f"{hand.title()} Hand Movement:\n")
-                for key, value in stats[hand].items():
-                    if isinstance(value, dict):
-                        f.write(f"  - {key}:\n")
-                        for k, v in value.items():
-                            f.write(f"    - {k}: {v:.4f}\n")
-                    elif isinstance(value, (int, float)):
-                        f.write(f"  - {key}: {value:.4f}\n")
-                    else:
-                        f.write(f"  - {key}: {value}\n")
-                f.write("\n")
-    
-    console.print(f"\n[green]Detailed report saved:[/green] {report_file}")
-
-# Silence Mediapipe/TensorFlow warnings
-sys.stderr = open(os.devnull, 'w')
-_ = mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=1, min_detection_confidence=0.5)
-time.sleep(0.3)
-_.close()
-sys.stderr = sys.__stderr__
-
-# --- Main Menu Loop ---
-while True:
-    console.clear()
-    table = Table(title="", show_lines=True, expand=True)
-    table.add_column("No.", justify="center", style="cyan")
-    table.add_column("Filename", justify="left", style="magenta")
-    table.add_column("Info", justify="left", style="green")
-
-    existing_videos = list_existing_videos()
-    if existing_videos:
-        for i, v in enumerate(existing_videos, 1):
-            info = get_video_info(os.path.join(video_folder, v))
-            table.add_row(str(i), v, info)
-    else:
-        table.add_row("-", "[red]None[/red]", "-")
-
-    console.print(table)
-    choice = console.input("\nEnter URL, filename/number, 'delete #', 'clear cache', or 'exit': ").strip()
-    if choice.lower() == "exit":
-        sys.exit(0)
-
-    try:
-        if choice.lower() == "clear cache":
-            if os.path.exists(cache_file):
-                os.remove(cache_file)
-                url_cache.clear()
-                console.print("[green]URL cache cleared.[/green]")
-            continue
-        if choice.lower().startswith("delete"):
-            try:
-                idx = int(choice.split()[1]) - 1
-                vid_to_delete = existing_videos[idx]
-                os.remove(os.path.join(video_folder, vid_to_delete))
-                console.print(f"[yellow]Deleted:[/yellow] {vid_to_delete}")
-            except:
-                console.print("[red]Invalid delete command.[/red]")
-            continue
-        if choice.isdigit() and 1 <= int(choice) <= len(existing_videos):
-            output_path = os.path.join(video_folder, existing_videos[int(choice)-1])
-        elif choice in existing_videos:
-            output_path = os.path.join(video_folder, choice)
-        elif choice in url_cache:
-            output_path = os.path.join(video_folder, url_cache[choice])
-        else:
-            url = choice
-            video_name = console.input("Enter a name for this video (no extension): ").strip()
-            output_name = f"{video_name}.mp4"
-            output_path = os.path.join(video_folder, output_name)
-
-            if not os.path.exists(output_path):
-                ydl_opts = {
-                    "format": "bestvideo+bestaudio/best",
-                    "outtmpl": os.path.join(video_folder, "tmp.%(ext)s"),
-                    "merge_output_format": "mp4",
-                    "ffmpeg_location": ffmpeg_path,
-                    "quiet": True,
-                    "no_warnings": True,
-                }
-                console.print("[green]Downloading video...[/green]")
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(url)
-                    downloaded_file = os.path.join(video_folder, "tmp." + info.get("ext", "mp4"))
-
-                subprocess.run([ffmpeg_path, "-i", downloaded_file, "-vf", "scale=iw/2:ih/2",
-                                "-c:v", "libx264", "-c:a", "aac", output_path],
-                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                if os.path.exists(downloaded_file):
-                    os.remove(downloaded_file)
-
-                url_cache[url] = output_name
-                with open(cache_file, "a") as f:
-                    f.write(f"{url}|||{output_name}\n")
-            else:
-                console.print(f"[yellow]File already exists:[/yellow] {output_path}")
-
-        if os.path.exists(output_path):
-            break
-        else:
-            console.print("[red]Video not found. Try again.[/red]")
-            continue
-
-    except Exception as e:
-        console.print(f"[red]Error: {e}. Try again.[/red]")
-        continue
-
-# --- CSV Setup & delete old files ---
-base_name = os.path.splitext(os.path.basename(output_path))[0]
-console.print(f"\n[cyan]Preparing to process:[/cyan] {base_name}")
-
-# Clean up old CSV and report files for this video
-clean_old_csv_files(base_name)
-clean_old_report_files(base_name)
-
-# --- Hand tracking ---
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-hands = mp_hands.Hands(static_image_mode=False, max_num_hands=4,
-                       min_detection_confidence=0.5, min_tracking_confidence=0.5)
-
-cap = cv2.VideoCapture(output_path)
-fps = cap.get(cv2.CAP_PROP_FPS)
-width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-duration_sec = total_frames / fps
-
-temp_fd, temp_path = tempfile.mkstemp(suffix=".mp4")
-os.close(temp_fd)
-fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-out = cv2.VideoWriter(temp_path, fourcc, fps, (width, height))
-
-csv_file = os.path.join(csv_folder, f"{base_name}_hand_data.csv")
-csv_columns = ["frame", "hand", "wrist_x", "wrist_y", "wrist_z", "num_landmarks"]
-csv_data = []
-
-console.print("[bold green]Processing video with hand tracking...[/bold green]")
-with Progress() as progress:
-    task = progress.add_task("[cyan]Tracking hands...", total=total_frames)
-    frame_idx = 0
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        frame_idx += 1
-
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = hands.process(rgb_frame)
-        if results.multi_hand_landmarks:
-            for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                handedness = results.multi_handedness[idx].classification[0].label
-                color = (0,0,255) if handedness=="Left" else (255,0,0)
-                mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                                          mp_drawing.DrawingSpec(color=color, thickness=2, circle_radius=3),
-                                          mp_drawing.DrawingSpec(color=color, thickness=2))
-                wrist = hand_landmarks.landmark[0]
-                csv_data.append({
-                    "frame": frame_idx,
-                    "hand": handedness,
-                    "wrist_x": wrist.x,
-                    "wrist_y": wrist.y,
-                    "wrist_z": wrist.z,
-                    "num_landmarks": len(hand_landmarks.landmark)
-                })
-
-        out.write(frame)
-        progress.update(task, advance=1)
-
-cap.release()
-out.release()
-hands.close()
-console.print("[bold green]Hand tracking complete![/bold green]")
-
-# --- Write CSV ---
-with open(csv_file, "w", newline="") as f:
-    writer = csv.DictWriter(f, fieldnames=csv_columns)
-    writer.writeheader()
-    writer.writerows(csv_data)
-console.print(f"[green]CSV saved:[/green] {csv_file}")
-
-# --- Generate Analysis Features ---
-console.print("\n[bold cyan]Generating analysis features...[/bold cyan]")
-
-# 1. ASCII Heatmap (CLI display)
-create_ascii_heatmap(csv_data, width, height, base_name)
-
-# 2. 3D Trajectory Visualization (HTML file)
-create_3d_trajectory(csv_data, base_name)
-
-# 3. Tracking Report (CLI display + text file)
-generate_tracking_report(csv_data, base_name, fps, duration_sec)
-
-# --- Merge audio back ---
-tracked_path = os.path.join(tracked_folder, f"tracked_{os.path.basename(output_path)}")
-subprocess.run([ffmpeg_path, "-y", "-i", temp_path, "-i", output_path,
-                "-c:v", "copy", "-c:a", "aac", "-map", "0:v:0", "-map", "1:a:0", tracked_path],
-               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-os.remove(temp_path)
-
-# --- Ask user for display preference ---
-console.print("\n[bold cyan]Video processing complete![/bold cyan]")
-while True:
-    display_choice = console.input("\nHow would you like to view the result?\n[1] Side-by-side (original + tracked)\n[2] Tracked video only\n[3] Skip video playback\nEnter choice (1-3): ").strip()
-    
-    if display_choice == "1":
-        # Play side-by-side with calculated positions
-        console.print("[green]Playing videos side-by-side...[/green]")
-        
-        # Calculate window positions for side-by-side display
-        # Get screen dimensions (approximate - adjust if needed)
-        screen_width = 1920  # You can modify this based on your screen
-        
-        # Calculate positions to center both videos
-        total_width = width * 2
-        start_x = max(0, (screen_width - total_width) // 2)
-        
-        # Left window (original)
-        left_x = start_x
-        left_y = 100  # Some padding from top
-        
-        # Right window (tracked)
-        right_x = start_x + width
-        right_y = 100
-        
-        p1 = subprocess.Popen([ffplay_path, "-autoexit", "-window_title", f"Original - {os.path.basename(output_path)}",
-                               "-x", str(width), "-y", str(height),
-                               "-left", str(left_x), "-top", str(left_y),
-                               output_path])
-        time.sleep(0.25)
-        p2 = subprocess.Popen([ffplay_path, "-autoexit", "-window_title", f"Tracked - {os.path.basename(tracked_path)}",
-                               "-x", str(width), "-y", str(height),
-                               "-left", str(right_x), "-top", str(right_y),
-                               "-an", tracked_path])
-        p1.wait()
-        p2.wait()
-        break
-    elif display_choice == "2":
-        # Play tracked video only
-        console.print("[green]Playing tracked video...[/green]")
-        p = subprocess.Popen([ffplay_path, "-autoexit", "-window_title", f"Tracked - {os.path.basename(tracked_path)}",
-                              "-x", str(width), "-y", str(height), tracked_path])
-        p.wait()
-        break
-    elif display_choice == "3":
-        # Skip video playback
-        console.print("[yellow]Skipping video playback.[/yellow]")
-        break
-    else:
-        console.print("[red]Invalid choice. Please enter 1, 2, or 3.[/red]")
-
-# --- Delete tracked video ---
-try:
-    os.remove(tracked_path)
-    console.print(f"[green]Deleted tracked file:[/green] {tracked_path}")
-except PermissionError:
-    console.print(f"[red]Could not delete:[/red] {tracked_path}")
-except FileNotFoundError:
-    console.print(f"[yellow]Tracked file already removed:[/yellow] {tracked_path}")
-
-console.print("\n[bold green]Process completed successfully![/bold green]")
-console.print(f"[cyan]Files generated:[/cyan]")
-console.print(f"  • CSV Data: {csv_file}")
-console.print(f"  • 3D Trajectory: {os.path.join(reports_folder, f'{base_name}_3d_trajectory.html')}")
-console.print(f"  • Analysis Report: {os.path.join(reports_folder, f'{base_name}_tracking_report.txt')}")
\ No newline at end of file
+import os, subprocess, time, sys, csv, shutil, multiprocessing, json, glob, threading, queue, gc
+from datetime import timedelta
+
+# Cap the OpenCV and TFLite thread pools at half the logical cores:
+# decode, inference, drawing and the progress display all run their own
+# threads, and letting each library claim every core just trades useful
+# work for context switches. OMP_NUM_THREADS must be set before
+# mediapipe (TFLite) is first imported to take effect.
+_THREAD_BUDGET = max(1, (os.cpu_count() or 2) // 2)
+os.environ.setdefault("OMP_NUM_THREADS", str(_THREAD_BUDGET))
+
+import yt_dlp, cv2
+import mediapipe as mp
+
+cv2.setNumThreads(_THREAD_BUDGET)
+from rich.console import Console
+from rich.panel import Panel
+from rich.align import Align
+from rich.table import Table
+from rich.progress import Progress
+from rich.text import Text
+import numpy as np
+
+# Numba is used to JIT-compile the numeric kernels when available;
+# everything falls back to plain NumPy without it
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# --- Setup paths ---
+# Get script directory for relative paths
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Create folders relative to script location
+video_folder = os.path.join(script_dir, "videos")
+tracked_folder = os.path.join(script_dir, "tracked") 
+csv_folder = os.path.join(script_dir, "csv_data")
+reports_folder = os.path.join(script_dir, "reports")
+cache_file = os.path.join(script_dir, "url_cache.json")
+legacy_cache_file = os.path.join(script_dir, "url_cache.txt")
+
+# Create required folders
+for folder in [video_folder, tracked_folder, csv_folder, reports_folder]:
+    os.makedirs(folder, exist_ok=True)
+
+# Find FFmpeg executables in PATH
+ffmpeg_path = shutil.which("ffmpeg") or "ffmpeg.exe"
+ffplay_path = shutil.which("ffplay") or "ffplay.exe"
+
+def ffmpeg_supports(kind, name):
+    """Check once whether the local ffmpeg build lists a decoder/encoder"""
+    try:
+        probe = subprocess.run([ffmpeg_path, "-hide_banner", f"-{kind}"],
+                               capture_output=True, text=True)
+        return name in probe.stdout
+    except OSError:
+        return False
+
+# Optional NVDEC-accelerated decoding through ffmpegcv; everything falls
+# back to cv2.VideoCapture when the package or a CUDA GPU is missing
+try:
+    import ffmpegcv
+    FFMPEGCV_AVAILABLE = True
+except ImportError:
+    FFMPEGCV_AVAILABLE = False
+
+USE_GPU_DECODE = FFMPEGCV_AVAILABLE and ffmpeg_supports("decoders", "h264_cuvid")
+
+# Pick the H.264 encoder once at startup: NVENC offloads encoding to the
+# GPU's media engine, otherwise use fast software x264
+if ffmpeg_supports("encoders", "h264_nvenc"):
+    video_encoder_args = ["-c:v", "h264_nvenc", "-preset", "p4"]
+else:
+    video_encoder_args = ["-c:v", "libx264", "-preset", "veryfast"]
+
+def open_video_capture(video_path):
+    """Open a video for frame reads, offloading decode to NVDEC when possible"""
+    if USE_GPU_DECODE:
+        try:
+            return ffmpegcv.VideoCaptureNV(video_path)
+        except Exception:
+            pass
+    return cv2.VideoCapture(video_path)
+
+class FrameReader:
+    """Prefetch decoded frames on a background thread.
+
+    Decoding a 1080p H.264 frame costs several milliseconds that would
+    otherwise serialize with inference; a small bounded queue hides that
+    latency while keeping memory use capped. read() returns None at
+    end of stream.
+
+    With a cv2-style capture, frames decode into a fixed pool of buffers
+    via grab()/retrieve() — call recycle() once a frame has been consumed
+    so the whole video costs a handful of allocations instead of one
+    frame-sized malloc per iteration.
+    """
+
+    def __init__(self, cap, depth=8):
+        self.cap = cap
+        self.queue = queue.Queue(maxsize=depth)
+        # ffmpegcv captures don't expose grab/retrieve, so they keep the
+        # plain read() path (they recycle internally anyway)
+        self.recycling = hasattr(cap, "grab") and hasattr(cap, "retrieve")
+        self.pool = queue.Queue()
+        # A few more buffers than queue slots, so the decoder isn't
+        # stalled by the one or two frames the consumer is still holding
+        self.pool_budget = depth + 4
+        self.stopped = False
+        self.thread = threading.Thread(target=self._reader, daemon=True)
+        self.thread.start()
+
+    def _next_buffer(self):
+        # First allocations come from retrieve() itself; once the pool is
+        # at full size, block until the consumer hands a buffer back
+        if self.pool_budget > 0:
+            self.pool_budget -= 1
+            return None
+        return self.pool.get()
+
+    def _reader(self):
+        while not self.stopped:
+            if self.recycling:
+                if not self.cap.grab():
+                    self.queue.put(None)
+                    break
+                ret, frame = self.cap.retrieve(self._next_buffer())
+            else:
+                ret, frame = self.cap.read()
+            if not ret:
+                self.queue.put(None)
+                break
+            self.queue.put(frame)
+
+    def read(self):
+        return self.queue.get()
+
+    def recycle(self, frame):
+        """Hand a consumed frame's buffer back for the decoder to reuse"""
+        if self.recycling:
+            self.pool.put(frame)
+
+    def release(self):
+        # On early consumer exit the thread may be parked in queue.put
+        # (queue full) or pool.get (no recycled buffers); set the stop
+        # flag and keep unblocking both until the thread actually exits,
+        # so the capture is never released while a read is in flight
+        self.stopped = True
+        while self.thread.is_alive():
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.pool.put(None)
+            self.thread.join(timeout=0.05)
+        self.cap.release()
+
+# --- Rich console ---
+console = Console()
+ascii_title = r"""
+                 _ _         ___ _                                    _ _____                _    _             
+  /\/\   ___  __| (_) __ _  / _ (_)_ __   ___    /\  /\__ _ _ __   __| /__   \_ __ __ _  ___| | _(_)_ __   __ _ 
+ /    \ / _ \/ _` | |/ _` |/ /_)/ | '_ \ / _ \  / /_/ / _` | '_ \ / _` | / /\/ '__/ _` |/ __| |/ / | '_ \ / _` |
+/ /\/\ \  __/ (_| | | (_| / ___/| | |_) |  __/ / __  / (_| | | | | (_| |/ /  | | | (_| | (__|   <| | | | | (_| |
+\/    \/\___|\__,_|_|\__,_\/    |_| .__/ \___| \/ /_/ \__,_|_| |_|\__,_|\/   |_|  \__,_|\___|_|\_\_|_| |_|\__, |
+                                  |_|                                                                     |___/ 
+"""
+def show_splash(animate=False):
+    # The blinking animation costs a flat 3 s per launch, so it only runs
+    # when explicitly requested with --splash
+    if animate:
+        for i in range(6):
+            console.clear()
+            border = "bold bright_blue" if i % 2 == 0 else "bold white"
+            console.print(Panel(Align.center(ascii_title, vertical="middle"), border_style=border, expand=True))
+            time.sleep(0.5)
+        console.clear()
+    else:
+        console.clear()
+        console.print(Panel(Align.center(ascii_title, vertical="middle"), border_style="bold bright_blue", expand=True))
+
+# --- URL Cache ---
+# Stored as one JSON document: a single parse at startup instead of
+# splitting the file line by line
+def save_url_cache():
+    with open(cache_file, "w") as f:
+        json.dump(url_cache, f, indent=2)
+
+url_cache = {}
+try:
+    with open(cache_file, "r") as f:
+        url_cache = json.load(f)
+except (OSError, ValueError):
+    pass
+
+# Migrate the old line-based url_cache.txt once, then drop it
+if os.path.exists(legacy_cache_file):
+    with open(legacy_cache_file, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                url, filename = line.split("|||")
+                url_cache.setdefault(url, filename)
+    save_url_cache()
+    os.remove(legacy_cache_file)
+
+# --- Helper functions ---
+def list_existing_videos():
+    # scandir DirEntry objects carry name, path and a cached stat from a
+    # single directory pass, so callers don't re-stat each file
+    return sorted((e for e in os.scandir(video_folder)
+                   if e.is_file() and e.name.lower().endswith(".mp4")),
+                  key=lambda e: e.name)
+
+# Cached per-file info so menu redraws don't reopen every video; entries
+# are invalidated when the file's mtime or size changes
+info_cache_file = os.path.join(video_folder, ".info_cache.json")
+try:
+    with open(info_cache_file, "r") as f:
+        _info_cache = json.load(f)
+except (OSError, ValueError):
+    _info_cache = {}
+
+def get_video_info(video_path, stat_result=None):
+    # Callers iterating scandir entries pass the DirEntry's cached stat
+    # to avoid a second kernel call per file
+    if stat_result is None:
+        try:
+            stat_result = os.stat(video_path)
+        except OSError:
+            return "Unable to open"
+    st = stat_result
+
+    key = os.path.basename(video_path)
+    cached = _info_cache.get(key)
+    if cached and cached[0] == st.st_mtime and cached[1] == st.st_size:
+        return cached[2]
+
+    # Force the FFmpeg backend so OpenCV skips backend autodetection
+    cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+    if not cap.isOpened():
+        return "Unable to open"
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    duration_sec = frame_count / fps if fps else 0
+    cap.release()
+
+    info = f"{str(timedelta(seconds=int(duration_sec)))} | {width}x{height} | {fps:.2f} FPS"
+    _info_cache[key] = [st.st_mtime, st.st_size, info]
+    try:
+        with open(info_cache_file, "w") as f:
+            json.dump(_info_cache, f)
+    except OSError:
+        pass
+    return info
+
+def clean_old_csv_files(base_name):
+    """Delete all existing CSV files for the same video"""
+    deleted_count = 0
+    found_count = 0
+
+    # One C-level directory scan instead of prefix/suffix checks per entry
+    pattern = os.path.join(csv_folder, f"{glob.escape(base_name)}*_hand_data.csv")
+    for csv_path in glob.iglob(pattern):
+        found_count += 1
+        try:
+            os.remove(csv_path)
+            deleted_count += 1
+            console.print(f"[yellow]Deleted old CSV:[/yellow] {os.path.basename(csv_path)}")
+        except Exception as e:
+            console.print(f"[red]Could not delete CSV {os.path.basename(csv_path)}: {e}[/red]")
+
+    if deleted_count > 0:
+        console.print(f"[green]Cleaned up {deleted_count} old CSV file(s) for {base_name}[/green]")
+    elif found_count:
+        console.print(f"[red]Found {found_count} old CSV file(s) but could not delete them[/red]")
+
+    return deleted_count
+
+def clean_old_report_files(base_name):
+    """Delete all existing report files for the same video"""
+    deleted_count = 0
+    found_count = 0
+
+    # Both report filenames are fully known, so check them directly
+    # instead of scanning the whole reports folder
+    for report_file in [f"{base_name}_3d_trajectory.html",
+                        f"{base_name}_tracking_report.txt"]:
+        report_path = os.path.join(reports_folder, report_file)
+        if not os.path.exists(report_path):
+            continue
+        found_count += 1
+        try:
+            os.remove(report_path)
+            deleted_count += 1
+            console.print(f"[yellow]Deleted old report:[/yellow] {report_file}")
+        except Exception as e:
+            console.print(f"[red]Could not delete report {report_file}: {e}[/red]")
+
+    if deleted_count > 0:
+        console.print(f"[green]Cleaned up {deleted_count} old report file(s) for {base_name}[/green]")
+    elif found_count:
+        console.print(f"[red]Found {found_count} old report file(s) but could not delete them[/red]")
+
+    return deleted_count
+
+# Hand codes used in the columnar layout below
+HAND_LEFT, HAND_RIGHT = 0, 1
+
+# The hand model always emits a full 21-point skeleton, so the per-row
+# count is a constant rather than a len() call per detection
+NUM_LANDMARKS = 21
+
+# Row layout used by the tracking loop; one entry per detected hand
+ROW_DTYPE = np.dtype([('frame', 'i4'), ('hand', 'u1'),
+                      ('wrist_x', 'f4'), ('wrist_y', 'f4'), ('wrist_z', 'f4'),
+                      ('num_landmarks', 'i2')])
+
+def columnarize(rows):
+    """Expose the tracking rows (ROW_DTYPE structured array) as a dict of
+    NumPy columns.
+
+    All analysis functions work on this structure-of-arrays layout so each
+    of them can use boolean masks and array math over contiguous data
+    ('hand' is encoded 0=Left, 1=Right).
+    """
+    n = rows.shape[0]
+    cols = {
+        'frame': rows['frame'],
+        'hand': rows['hand'],
+        'wrist_x': rows['wrist_x'],
+        'wrist_y': rows['wrist_y'],
+        'wrist_z': rows['wrist_z'],
+    }
+    # Shared metadata every analysis function needs, computed exactly once
+    # instead of re-scanned per function
+    cols['left_mask'] = cols['hand'] == HAND_LEFT
+    cols['right_mask'] = ~cols['left_mask'] if n else cols['left_mask']
+    cols['left_idx'] = np.flatnonzero(cols['left_mask'])
+    cols['right_idx'] = np.flatnonzero(cols['right_mask'])
+    cols['max_frame'] = int(cols['frame'].max()) if n else 0
+    cols['unique_frames'] = int(np.unique(cols['frame']).size)
+    return cols
+
+def _heatmap_bins_numpy(grid_x, grid_y, weights, grid_width, grid_height):
+    """NumPy fallback for _heatmap_bins (same return layout)."""
+    return np.bincount(grid_y * grid_width + grid_x, weights=weights,
+                       minlength=grid_width * grid_height).reshape(grid_height, grid_width)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _heatmap_bins(grid_x, grid_y, weights, grid_width, grid_height):
+        """Accumulate weighted detections straight into the heatmap grid,
+        skipping the flattened-index temporary the bincount path needs."""
+        out = np.zeros((grid_height, grid_width), dtype=np.float32)
+        for i in range(grid_x.shape[0]):
+            out[grid_y[i], grid_x[i]] += weights[i]
+        return out
+else:
+    _heatmap_bins = _heatmap_bins_numpy
+
+def create_ascii_heatmap(cols, width, height, base_name):
+    """Create enhanced ASCII heatmap for CLI display"""
+    console.print("\n" + "="*80)
+    console.print(Panel(
+        Align.center(f"[bold cyan]HAND MOVEMENT HEATMAP[/bold cyan]\n[dim]{base_name}[/dim]",
+                     vertical="middle"),
+        border_style="bold cyan",
+        expand=True
+    ))
+
+    if not cols['frame'].size:
+        console.print("[red]No tracking data available for heatmap[/red]")
+        return
+
+    # Create 2D grid for heatmap (increased resolution for better clarity)
+    grid_width, grid_height = 80, 25
+
+    # Bin tracking data into the grid in one pass (compiled kernel when
+    # numba is present, vectorized bincount otherwise)
+    is_right = cols['right_mask']
+
+    grid_x = np.clip((cols['wrist_x'] * (grid_width - 1)).astype(np.int32), 0, grid_width - 1)
+    grid_y = np.clip((cols['wrist_y'] * (grid_height - 1)).astype(np.int32), 0, grid_height - 1)
+
+    # Weight by hand type for better visualization
+    weights = np.where(is_right, 1.5, 1.0).astype(np.float32)
+    heatmap = _heatmap_bins(grid_x, grid_y, weights, grid_width, grid_height)
+    
+    # Normalize heatmap
+    if heatmap.max() > 0:
+        heatmap = heatmap / heatmap.max()
+    
+    # Enhanced ASCII visualization with better contrast
+    chars = [' ', '·', '░', '▒', '▓', '█']
+    colors = ['black', 'dim blue', 'blue', 'cyan', 'yellow', 'red']
+
+    # Map intensities to palette indices in one array op, then build the
+    # whole framed block as a single string so rich parses the markup and
+    # flushes the grid exactly once
+    palette = [f"[{color}]{char}[/{color}]" for char, color in zip(chars, colors)]
+    char_idx = (heatmap * (len(chars) - 1)).astype(np.intp)
+
+    lines = ["┌" + "─" * grid_width + "┐"]
+    for i, row in enumerate(char_idx):
+        body = "".join([palette[c] for c in row])
+
+        # Add row indicators for orientation
+        if i == 0:
+            lines.append(f"│{body}│ [dim]← Top[/dim]")
+        elif i == len(char_idx) - 1:
+            lines.append(f"│{body}│ [dim]← Bottom[/dim]")
+        elif i == len(char_idx) // 2:
+            lines.append(f"│{body}│ [dim]← Center[/dim]")
+        else:
+            lines.append(f"│{body}│")
+    lines.append("└" + "─" * grid_width + "┘")
+    console.print("\n".join(lines))
+    
+    # Enhanced legend and statistics
+    legend_table = Table(show_header=False, box=None, padding=(0, 1))
+    legend_table.add_column("Symbol", style="bold")
+    legend_table.add_column("Intensity", style="dim")
+    legend_table.add_column("Color", style="bold")
+    
+    legend_items = [
+        (" ", "No Activity", "black"),
+        ("·", "Minimal", "dim blue"), 
+        ("░", "Low", "blue"),
+        ("▒", "Medium", "cyan"),
+        ("▓", "High", "yellow"),
+        ("█", "Very High", "red")
+    ]
+    
+    for symbol, intensity, color in legend_items:
+        legend_table.add_row(
+            f"[{color}]{symbol}[/{color}]",
+            intensity,
+            color.title()
+        )
+    
+    console.print("\n[bold]Legend:[/bold]")
+    console.print(legend_table)
+    
+    # Statistics summary
+    stats_table = Table(title="Movement Statistics", show_header=True, header_style="bold magenta")
+    stats_table.add_column("Metric", style="cyan")
+    stats_table.add_column("Value", style="white")
+    
+    total_detections = int(cols['frame'].size)
+    right_detections = int(np.count_nonzero(is_right))
+    left_detections = total_detections - right_detections
+    coverage = np.count_nonzero(heatmap) / heatmap.size * 100
+    
+    stats_table.add_row("Total Hand Detections", str(total_detections))
+    stats_table.add_row("Left Hand Detections", f"{left_detections} ({left_detections/total_detections*100:.1f}%)" if total_detections > 0 else "0")
+    stats_table.add_row("Right Hand Detections", f"{right_detections} ({right_detections/total_detections*100:.1f}%)" if total_detections > 0 else "0")
+    stats_table.add_row("Screen Coverage", f"{coverage:.1f}%")
+    stats_table.add_row("Grid Resolution", f"{width} × {height}")
+    stats_table.add_row("Video Resolution", f"{width} × {height}")
+    
+    console.print("\n")
+    console.print(stats_table)
+    console.print("="*80)
+
+def create_3d_trajectory(cols, base_name):
+    """Create user-friendly 3D trajectory visualization using Plotly"""
+    # Imported lazily: plotly costs seconds of startup time and is only
+    # needed once a trajectory is actually rendered
+    import plotly.graph_objects as go
+
+    if not cols['frame'].size:
+        console.print("[red]No tracking data available for 3D trajectory[/red]")
+        return
+
+    console.print("[green]Generating 3D trajectory visualization...[/green]")
+
+    # Separate data by hand with the precomputed index arrays, sorted by
+    # frame; each column below is then sliced with one fancy-index
+    left_sel = cols['left_idx'][np.argsort(cols['frame'][cols['left_idx']], kind='stable')]
+    right_sel = cols['right_idx'][np.argsort(cols['frame'][cols['right_idx']], kind='stable')]
+
+    fig = go.Figure()
+
+    # Add left hand trajectory
+    if left_sel.size:
+        # Plotly accepts NumPy arrays directly and serializes contiguous
+        # data in one go, so no Python lists are built here
+        x_left = cols['wrist_x'][left_sel]
+        y_left = cols['wrist_y'][left_sel]
+        z_left = cols['wrist_z'][left_sel]
+        frames_left = cols['frame'][left_sel]
+
+        fig.add_trace(go.Scatter3d(
+            x=x_left, y=y_left, z=z_left,
+            mode='lines+markers',
+            marker=dict(size=4, color=frames_left, colorscale='Reds', 
+                       showscale=True, colorbar=dict(title="Video Frame", x=1.15)),
+            line=dict(color='red', width=6),
+            name='Left Hand Path',
+            hovertemplate='<b>Left Hand</b><br>' +
+                         'Horizontal: %{x:.3f}<br>' +
+                         'Vertical: %{y:.3f}<br>' +
+                         'Depth: %{z:.3f}<br>' +
+                         'Frame: %{marker.color}<br>' +
+                         '<i>Red line shows left hand movement</i><extra></extra>'
+        ))
+    
+    # Add right hand trajectory
+    if right_sel.size:
+        x_right = cols['wrist_x'][right_sel]
+        y_right = cols['wrist_y'][right_sel]
+        z_right = cols['wrist_z'][right_sel]
+        frames_right = cols['frame'][right_sel]
+
+        fig.add_trace(go.Scatter3d(
+            x=x_right, y=y_right, z=z_right,
+            mode='lines+markers',
+            marker=dict(size=4, color=frames_right, colorscale='Blues', 
+                       showscale=True, colorbar=dict(title="Video Frame", x=1.25)),
+            line=dict(color='blue', width=6),
+            name='Right Hand Path',
+            hovertemplate='<b>Right Hand</b><br>' +
+                         'Horizontal: %{x:.3f}<br>' +
+                         'Vertical: %{y:.3f}<br>' +
+                         'Depth: %{z:.3f}<br>' +
+                         'Frame: %{marker.color}<br>' +
+                         '<i>Blue line shows right hand movement</i><extra></extra>'
+        ))
+    
+    # Add starting points for clarity
+    if left_sel.size:
+        fig.add_trace(go.Scatter3d(
+            x=[x_left[0]], y=[y_left[0]], z=[z_left[0]],
+            mode='markers',
+            marker=dict(size=12, color='darkred', symbol='diamond'),
+            name='Left Hand Start',
+            hovertemplate='<b>Left Hand Starting Point</b><br>Frame: %{text}<extra></extra>',
+            text=[frames_left[0]]
+        ))
+    
+    if right_sel.size:
+        fig.add_trace(go.Scatter3d(
+            x=[x_right[0]], y=[y_right[0]], z=[z_right[0]],
+            mode='markers',
+            marker=dict(size=12, color='darkblue', symbol='diamond'),
+            name='Right Hand Start',
+            hovertemplate='<b>Right Hand Starting Point</b><br>Frame: %{text}<extra></extra>',
+            text=[frames_right[0]]
+        ))
+    
+    # Create comprehensive title and annotations
+    total_frames = cols['max_frame']
+    left_count = int(left_sel.size)
+    right_count = int(right_sel.size)
+    
+    title_text = f"<b>Hand Movement Analysis: {base_name}</b><br>" + \
+                f"<span style='font-size: 14px;'>Left Hand: {left_count} detections | " + \
+                f"Right Hand: {right_count} detections | Total Frames: {total_frames}</span>"
+    
+    # Customize layout with detailed explanations
+    fig.update_layout(
+        title=dict(
+            text=title_text,
+            x=0.5,
+            font=dict(size=18)
+        ),
+        scene=dict(
+            xaxis_title='<b>Horizontal Position</b><br><i>(0 = Left Edge, 1 = Right Edge)</i>',
+            yaxis_title='<b>Vertical Position</b><br><i>(0 = Top Edge, 1 = Bottom Edge)</i>',
+            zaxis_title='<b>Depth Position</b><br><i>(Closer to camera = Larger values)</i>',
+            bgcolor='rgba(240,240,240,0.9)',
+            xaxis=dict(gridcolor='gray', range=[0, 1], dtick=0.2),
+            yaxis=dict(gridcolor='gray', range=[0, 1], dtick=0.2),
+            zaxis=dict(gridcolor='gray'),
+            camera=dict(
+                eye=dict(x=1.5, y=1.5, z=1.5),  # Better default viewing angle
+                up=dict(x=0, y=0, z=1)
+            )
+        ),
+        font=dict(size=12),
+        showlegend=True,
+        legend=dict(
+            yanchor="top",
+            y=0.99,
+            xanchor="left",
+            x=0.01,
+            bgcolor="rgba(255,255,255,0.8)"
+        ),
+        annotations=[
+            dict(
+                text="<b>How to Read This Graph:</b><br>" +
+                     "• Red lines = Left hand movement path<br>" +
+                     "• Blue lines = Right hand movement path<br>" +
+                     "• Diamonds = Starting positions<br>" +
+                     "• Darker colors = Earlier in video<br>" +
+                     "• Lighter colors = Later in video<br>" +
+                     "• Use mouse to rotate and zoom",
+                showarrow=False,
+                xref="paper", yref="paper",
+                x=0.02, y=0.02,
+                xanchor="left", yanchor="bottom",
+                bgcolor="rgba(255,255,255,0.9)",
+                bordercolor="gray",
+                borderwidth=1,
+                font=dict(size=11)
+            )
+        ]
+    )
+    
+    # Save and show
+    trajectory_file = os.path.join(reports_folder, f"{base_name}_3d_trajectory.html")
+    fig.write_html(trajectory_file)
+    console.print(f"[green]3D trajectory saved:[/green] {trajectory_file}")
+    
+    # Auto-open in browser with user-friendly message
+    try:
+        import webbrowser
+        webbrowser.open(f'file://{os.path.abspath(trajectory_file)}')
+        console.print("[cyan]Opening interactive 3D hand movement visualization...[/cyan]")
+        console.print("[dim]Tip: Use your mouse to rotate, zoom, and explore the 3D space![/dim]")
+    except:
+        console.print("[yellow]Could not auto-open browser. Please open the HTML file manually.[/yellow]")
+
+def _hand_stats_numpy(xs, ys, zs, frames, fps):
+    """NumPy fallback for _hand_stats (same return layout)."""
+    points = np.stack([xs, ys, zs], axis=1).astype(np.float64)
+    distances = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    frame_diffs = np.diff(frames)
+    if fps > 0:
+        valid = frame_diffs > 0
+        speeds = distances[valid] / (frame_diffs[valid] / fps)
+    else:
+        speeds = np.empty(0)
+    ranges = points.max(axis=0) - points.min(axis=0)
+    center = points.mean(axis=0)
+    if distances.size:
+        dist_stats = (distances.sum(), distances.mean(), distances.max(), distances.min())
+    else:
+        dist_stats = (0.0, 0.0, 0.0, 0.0)
+    if speeds.size:
+        speed_std = speeds.std() if speeds.size > 1 else 0.0
+        speed_stats = (speeds.mean(), speeds.max(), speeds.min(), speed_std)
+    else:
+        speed_stats = (0.0, 0.0, 0.0, 0.0)
+    return dist_stats + speed_stats + (ranges[0], ranges[1], ranges[2],
+                                       center[0], center[1], center[2])
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _hand_stats(xs, ys, zs, frames, fps):
+        """Single-pass movement kernel for one hand (arrays sorted by frame).
+
+        Returns (total_dist, avg_dist, max_dist, min_dist,
+                 avg_speed, max_speed, min_speed, speed_std,
+                 x_range, y_range, z_range, com_x, com_y, com_z).
+        """
+        n = xs.shape[0]
+        x_min = x_max = xs[0]
+        y_min = y_max = ys[0]
+        z_min = z_max = zs[0]
+        sum_x = sum_y = sum_z = 0.0
+        for i in range(n):
+            x, y, z = xs[i], ys[i], zs[i]
+            sum_x += x; sum_y += y; sum_z += z
+            if x < x_min: x_min = x
+            if x > x_max: x_max = x
+            if y < y_min: y_min = y
+            if y > y_max: y_max = y
+            if z < z_min: z_min = z
+            if z > z_max: z_max = z
+
+        # Speeds are reduced in the same pass via running sum / sum of
+        # squares, so no temporary speeds array is ever materialized
+        total_dist = 0.0
+        max_dist = 0.0
+        min_dist = np.inf
+        speed_sum = 0.0
+        speed_sq_sum = 0.0
+        max_speed = 0.0
+        min_speed = np.inf
+        n_speeds = 0
+        for i in range(1, n):
+            dx = xs[i] - xs[i-1]
+            dy = ys[i] - ys[i-1]
+            dz = zs[i] - zs[i-1]
+            dist = np.sqrt(dx*dx + dy*dy + dz*dz)
+            total_dist += dist
+            if dist > max_dist: max_dist = dist
+            if dist < min_dist: min_dist = dist
+            frame_diff = frames[i] - frames[i-1]
+            if frame_diff > 0 and fps > 0:
+                speed = dist / (frame_diff / fps)
+                speed_sum += speed
+                speed_sq_sum += speed * speed
+                if speed > max_speed: max_speed = speed
+                if speed < min_speed: min_speed = speed
+                n_speeds += 1
+
+        if n > 1:
+            avg_dist = total_dist / (n - 1)
+        else:
+            avg_dist = 0.0
+            min_dist = 0.0
+
+        if n_speeds > 0:
+            avg_speed = speed_sum / n_speeds
+            if n_speeds > 1:
+                variance = speed_sq_sum / n_speeds - avg_speed * avg_speed
+                speed_std = np.sqrt(variance) if variance > 0.0 else 0.0
+            else:
+                speed_std = 0.0
+        else:
+            avg_speed = max_speed = min_speed = speed_std = 0.0
+
+        return (total_dist, avg_dist, max_dist, min_dist,
+                avg_speed, max_speed, min_speed, speed_std,
+                x_max - x_min, y_max - y_min, z_max - z_min,
+                sum_x / n, sum_y / n, sum_z / n)
+else:
+    _hand_stats = _hand_stats_numpy
+
+def calculate_movement_stats(cols, fps):
+    """Calculate detailed movement statistics"""
+    if not cols['frame'].size:
+        return {}
+
+    stats = {'left': {}, 'right': {}, 'combined': {}}
+
+    for hand_key, mask in [('left', cols['left_mask']), ('right', cols['right_mask'])]:
+        if not mask.any():
+            continue
+
+        # Sort by frame number to ensure correct order
+        frames = cols['frame'][mask].astype(np.int64)
+        order = np.argsort(frames, kind='stable')
+        frames = frames[order]
+
+        xs = cols['wrist_x'][mask][order].astype(np.float64)
+        ys = cols['wrist_y'][mask][order].astype(np.float64)
+        zs = cols['wrist_z'][mask][order].astype(np.float64)
+
+        # Basic counts
+        stats[hand_key]['total_detections'] = int(mask.sum())
+        stats[hand_key]['frames_active'] = int(np.unique(frames).size)
+
+        # All movement math runs in one compiled pass (Numba) or the
+        # vectorized NumPy fallback when Numba is not installed
+        (total_dist, avg_dist, max_dist, min_dist,
+         avg_speed, max_speed, min_speed, speed_std,
+         x_range, y_range, z_range, com_x, com_y, com_z) = _hand_stats(xs, ys, zs, frames, fps)
+
+        stats[hand_key]['total_distance'] = float(total_dist)
+        stats[hand_key]['avg_distance_per_frame'] = float(avg_dist)
+        stats[hand_key]['max_distance_per_frame'] = float(max_dist)
+        stats[hand_key]['min_distance_per_frame'] = float(min_dist)
+
+        stats[hand_key]['avg_speed'] = float(avg_speed)
+        stats[hand_key]['max_speed'] = float(max_speed)
+        stats[hand_key]['min_speed'] = float(min_speed)
+        stats[hand_key]['speed_std'] = float(speed_std)
+
+        stats[hand_key]['position_ranges'] = {
+            'x_range': float(x_range),
+            'y_range': float(y_range),
+            'z_range': float(z_range),
+        }
+
+        stats[hand_key]['center_of_mass'] = {
+            'x': float(com_x),
+            'y': float(com_y),
+            'z': float(com_z)
+        }
+    
+    # Combined statistics
+    stats['combined']['total_detections'] = int(cols['frame'].size)
+    stats['combined']['unique_frames'] = cols['unique_frames']
+    max_frame = cols['max_frame']
+    stats['combined']['detection_rate'] = (stats['combined']['unique_frames'] / max_frame * 100) if max_frame > 0 else 0
+
+    return stats
+
+def generate_tracking_report(cols, base_name, fps, duration_sec):
+    """Generate comprehensive tracking analysis report in CLI"""
+    console.print("\n[bold cyan]═══ TRACKING ANALYSIS REPORT ═══[/bold cyan]")
+
+    if not cols['frame'].size:
+        console.print("[red]No tracking data available for report[/red]")
+        return
+
+    # Calculate statistics
+    stats = calculate_movement_stats(cols, fps)
+    
+    # Video Information Section
+    report_table = Table(title="Video Information", show_header=True, header_style="bold magenta")
+    report_table.add_column("Property", style="cyan", width=20)
+    report_table.add_column("Value", style="white")
+    
+    report_table.add_row("Video Name", base_name)
+    report_table.add_row("Duration", f"{duration_sec:.2f} seconds")
+    report_table.add_row("FPS", f"{fps:.2f}")
+    report_table.add_row("Total Frames", f"{int(duration_sec * fps)}")
+    
+    console.print(report_table)
+    
+    # Detection Summary
+    detection_table = Table(title="Hand Detection Summary", show_header=True, header_style="bold magenta")
+    detection_table.add_column("Hand", style="cyan", width=15)
+    detection_table.add_column("Detections", style="green", width=12)
+    detection_table.add_column("Active Frames", style="yellow", width=15)
+    detection_table.add_column("Detection Rate", style="blue", width=15)
+    
+    total_frames = int(duration_sec * fps)
+    
+    for hand in ['left', 'right']:
+        if hand in stats and 'total_detections' in stats[hand]:
+            detections = stats[hand]['total_detections']
+            active_frames = stats[hand]['frames_active']
+            detection_rate = (active_frames / total_frames * 100) if total_frames > 0 else 0
+            
+            detection_table.add_row(
+                hand.title(),
+                str(detections),
+                str(active_frames),
+                f"{detection_rate:.1f}%"
+            )
+    
+    console.print(detection_table)
+    
+    # Movement Analysis
+    movement_table = Table(title="Movement Analysis", show_header=True, header_style="bold magenta")
+    movement_table.add_column("Metric", style="cyan", width=25)
+    movement_table.add_column("Left Hand", style="red", width=15)
+    movement_table.add_column("Right Hand", style="blue", width=15)
+    
+    # Each metric carries a direct accessor, replacing the old
+    # dotted-key string walk and per-cell try/except format() calls
+    def metric_value(side, getter, digits):
+        try:
+            return f"{getter(stats[side]):.{digits}f}"
+        except KeyError:
+            return "N/A"
+
+    metrics = [
+        ("Total Distance", lambda s: s['total_distance'], 4),
+        ("Avg Speed (units/sec)", lambda s: s['avg_speed'], 4),
+        ("Max Speed (units/sec)", lambda s: s['max_speed'], 4),
+        ("Speed Variation (std)", lambda s: s['speed_std'], 4),
+        ("X Movement Range", lambda s: s['position_ranges']['x_range'], 3),
+        ("Y Movement Range", lambda s: s['position_ranges']['y_range'], 3),
+        ("Z Movement Range", lambda s: s['position_ranges']['z_range'], 3),
+    ]
+
+    for metric_name, getter, digits in metrics:
+        movement_table.add_row(metric_name,
+                               metric_value('left', getter, digits),
+                               metric_value('right', getter, digits))
+    
+    console.print(movement_table)
+    
+    # Save detailed report to file: assemble every line first, then issue
+    # a single atomic write
+    lines = [
+        "HAND TRACKING ANALYSIS REPORT",
+        "=" * 50,
+        f"Video: {base_name}",
+        f"Duration: {duration_sec:.2f} seconds",
+        f"FPS: {fps:.2f}",
+        f"Total Frames: {int(duration_sec * fps)}",
+        "",
+        "DETECTION SUMMARY:",
+        "-" * 30,
+    ]
+    for hand in ['left', 'right']:
+        if hand in stats and 'total_detections' in stats[hand]:
+            lines.append(f"{hand.title()} Hand:")
+            lines.append(f"  - Total Detections: {stats[hand]['total_detections']}")
+            lines.append(f"  - Active Frames: {stats[hand]['frames_active']}")
+            lines.append(f"  - Detection Rate: {stats[hand]['frames_active']/total_frames*100:.1f}%")
+
+    lines.append("")
+    lines.append("MOVEMENT ANALYSIS:")
+    lines.append("-" * 30)
+    for hand in ['left', 'right']:
+        if hand in stats and 'total_distance' in stats[hand]:
+            lines.append(f"{hand.title()} Hand Movement:")
+            for key, value in stats[hand].items():
+                if isinstance(value, dict):
+                    lines.append(f"  - {key}:")
+                    for k, v in value.items():
+                        lines.append(f"    - {k}: {v:.4f}")
+                elif isinstance(value, (int, float)):
+                    lines.append(f"  - {key}: {value:.4f}")
+                else:
+                    lines.append(f"  - {key}: {value}")
+            lines.append("")
+
+    report_file = os.path.join(reports_folder, f"{base_name}_tracking_report.txt")
+    with open(report_file, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+
+    console.print(f"\n[green]Detailed report saved:[/green] {report_file}")
+
+# The Tasks-API HandLandmarker in VIDEO mode has lower per-call overhead
+# than the legacy solutions wrapper, but it needs the hand_landmarker.task
+# model bundle (https://developers.google.com/mediapipe - not shipped with
+# this repo) next to the script; the legacy API stays the fallback
+hand_landmarker_model = os.path.join(script_dir, "hand_landmarker.task")
+USE_TASKS_API = os.path.exists(hand_landmarker_model)
+
+def get_hand_landmarker():
+    """Create a VIDEO-mode landmarker for one video.
+
+    Unlike the legacy Hands object this cannot be cached across videos:
+    detect_for_video demands monotonically increasing timestamps per
+    instance, and our timestamps restart at zero for every video, so
+    each tracking run gets a fresh instance.
+    """
+    from mediapipe.tasks import python as mp_tasks
+    from mediapipe.tasks.python import vision
+
+    def make(delegate):
+        options = vision.HandLandmarkerOptions(
+            base_options=mp_tasks.BaseOptions(model_asset_path=hand_landmarker_model,
+                                              delegate=delegate),
+            running_mode=vision.RunningMode.VIDEO,
+            num_hands=2,
+            min_hand_detection_confidence=0.6,
+            min_tracking_confidence=0.7)
+        return vision.HandLandmarker.create_from_options(options)
+
+    # Inference on the GPU delegate when the host supports it;
+    # create_from_options raises on unsupported hosts, so failures
+    # just mean the usual CPU delegate
+    try:
+        return make(mp_tasks.BaseOptions.Delegate.GPU)
+    except Exception:
+        return make(mp_tasks.BaseOptions.Delegate.CPU)
+
+def _landmarks_to_proto(landmarks):
+    """Convert Tasks-API landmarks to the proto list the drawing utils expect"""
+    from mediapipe.framework.formats import landmark_pb2
+    proto = landmark_pb2.NormalizedLandmarkList()
+    proto.landmark.extend(landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z)
+                          for lm in landmarks)
+    return proto
+
+# One Hands instance shared across videos: every instantiation reloads
+# the TFLite model graph and reallocates its inference buffers, so the
+# model is created once on first use and then reused
+_hands_instance = None
+
+def _reset_detectors():
+    """Pool initializer: force workers to build their own detector.
+
+    On platforms where multiprocessing forks, a worker inherits the
+    parent's warmed _hands_instance — but not the MediaPipe graph
+    threads behind it, so hands.process() would hang forever. Clearing
+    the cache makes the first get_hands() call in each worker create a
+    working instance.
+    """
+    global _hands_instance
+    _hands_instance = None
+
+def get_hands():
+    global _hands_instance
+    if _hands_instance is None:
+        # The first model load prints Mediapipe/TensorFlow warnings;
+        # silence them like the old warmup did
+        stderr = sys.stderr
+        sys.stderr = open(os.devnull, 'w')
+        try:
+            # With tracking confidence above detection confidence the
+            # expensive palm detector only runs when landmark tracking
+            # loses a hand, instead of being eligible every frame; two
+            # hands is all the left/right analysis ever uses
+            _hands_instance = mp.solutions.hands.Hands(
+                static_image_mode=False, max_num_hands=2,
+                min_detection_confidence=0.6, min_tracking_confidence=0.7)
+        finally:
+            sys.stderr = stderr
+    return _hands_instance
+
+# Hand-skeleton connection pairs as an index array, built once so each
+# frame's line segments come from a single fancy-index of the landmark
+# points instead of a Python loop over the connection set
+HAND_CONN_IDX = np.array(sorted(mp.solutions.hands.HAND_CONNECTIONS), dtype=np.intp)
+
+def draw_hand(frame, hand_landmarks, width, height, color):
+    """Draw one hand's skeleton onto frame with batched OpenCV calls.
+
+    All 21 landmarks become one (21, 2) pixel array, every bone is drawn
+    by a single cv2.polylines call, and only the joint dots loop in
+    Python — far fewer C-call round trips than mp_drawing.draw_landmarks.
+    """
+    pts = np.array([(lm.x * width, lm.y * height) for lm in hand_landmarks.landmark],
+                   dtype=np.int32)
+    cv2.polylines(frame, pts[HAND_CONN_IDX], False, color, 2)
+    for p in pts:
+        cv2.circle(frame, (int(p[0]), int(p[1])), 3, color, -1)
+
+# --- Main Menu Loop ---
+def select_video():
+    """Show the menu until the user picks a video; returns its path, or 'batch'."""
+    while True:
+        console.clear()
+        table = Table(title="", show_lines=True, expand=True)
+        table.add_column("No.", justify="center", style="cyan")
+        table.add_column("Filename", justify="left", style="magenta")
+        table.add_column("Info", justify="left", style="green")
+
+        existing_videos = list_existing_videos()
+        existing_names = [e.name for e in existing_videos]
+        if existing_videos:
+            for i, v in enumerate(existing_videos, 1):
+                info = get_video_info(v.path, v.stat())
+                table.add_row(str(i), v.name, info)
+        else:
+            table.add_row("-", "[red]None[/red]", "-")
+
+        console.print(table)
+        choice = console.input("\nEnter URL, filename/number, 'delete #', 'batch', 'clear cache', or 'exit': ").strip()
+        if choice.lower() == "exit":
+            sys.exit(0)
+
+        try:
+            if choice.lower() == "batch":
+                return "batch"
+            if choice.lower() == "clear cache":
+                if os.path.exists(cache_file):
+                    os.remove(cache_file)
+                    url_cache.clear()
+                    console.print("[green]URL cache cleared.[/green]")
+                continue
+            if choice.lower().startswith("delete"):
+                try:
+                    idx = int(choice.split()[1]) - 1
+                    vid_to_delete = existing_videos[idx]
+                    os.remove(vid_to_delete.path)
+                    console.print(f"[yellow]Deleted:[/yellow] {vid_to_delete.name}")
+                except:
+                    console.print("[red]Invalid delete command.[/red]")
+                continue
+            if choice.isdigit() and 1 <= int(choice) <= len(existing_videos):
+                output_path = existing_videos[int(choice)-1].path
+            elif choice in existing_names:
+                output_path = os.path.join(video_folder, choice)
+            elif choice in url_cache:
+                output_path = os.path.join(video_folder, url_cache[choice])
+            else:
+                url = choice
+                video_name = console.input("Enter a name for this video (no extension): ").strip()
+                output_name = f"{video_name}.mp4"
+                output_path = os.path.join(video_folder, output_name)
+
+                if not os.path.exists(output_path):
+                    ydl_opts = {
+                        "format": "bestvideo+bestaudio/best",
+                        "outtmpl": os.path.join(video_folder, f"{video_name}.%(ext)s"),
+                        "merge_output_format": "mp4",
+                        "ffmpeg_location": ffmpeg_path,
+                        "quiet": True,
+                        "no_warnings": True,
+                        # Run the half-resolution re-encode inside yt-dlp's own
+                        # ffmpeg postprocessing instead of a second full
+                        # decode+encode pass over the downloaded file
+                        "postprocessor_args": ["-vf", "scale=iw/2:ih/2"] + video_encoder_args + ["-c:a", "aac"],
+                    }
+                    console.print("[green]Downloading video...[/green]")
+                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                        ydl.extract_info(url)
+
+                    if not os.path.exists(output_path):
+                        # The 'best' fallback downloads a pre-merged single
+                        # file, so the merge postprocessor (and with it the
+                        # half-resolution re-encode) never ran and the
+                        # extension may not be mp4. Re-encode whatever
+                        # landed on disk into the expected mp4
+                        candidates = [p for p in glob.glob(os.path.join(video_folder, glob.escape(video_name) + ".*"))
+                                      if not p.endswith(".part")]
+                        if candidates:
+                            subprocess.run([ffmpeg_path, "-y", "-i", candidates[0],
+                                            "-vf", "scale=iw/2:ih/2"] + video_encoder_args +
+                                           ["-c:a", "aac", output_path],
+                                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                            if os.path.exists(output_path):
+                                os.remove(candidates[0])
+
+                    url_cache[url] = output_name
+                    save_url_cache()
+                else:
+                    console.print(f"[yellow]File already exists:[/yellow] {output_path}")
+
+            if os.path.exists(output_path):
+                return output_path
+            else:
+                console.print("[red]Video not found. Try again.[/red]")
+                continue
+
+        except Exception as e:
+            console.print(f"[red]Error: {e}. Try again.[/red]")
+            continue
+
+# --- Hand tracking ---
+def inference_size(width, height, max_width=640):
+    """Resolution to downscale frames to before inference, or None.
+
+    The hand model's input is 256x256, so anything much wider than 640 px
+    just adds work to MediaPipe's internal resize. Landmarks come back
+    normalized, so drawing and analysis on the full-resolution frame are
+    unaffected by inferring on a smaller copy.
+    """
+    if width <= max_width:
+        return None
+    return (max_width, max(round(height * max_width / width), 1))
+
+def detect_hands_in_frame(rgb_frame, frame_idx, fps, landmarker, hands):
+    """Run whichever detector is active; returns (handedness, landmarks) pairs"""
+    if landmarker is not None:
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        result = landmarker.detect_for_video(mp_image, int(frame_idx * 1000 / fps))
+        return [(hd[0].category_name, _landmarks_to_proto(lms))
+                for lms, hd in zip(result.hand_landmarks, result.handedness)]
+    # A read-only buffer lets hands.process hand the frame straight to the
+    # graph instead of taking a defensive full-frame copy; the Tasks path
+    # above already wraps the ndarray without copying via mp.Image
+    rgb_frame.flags.writeable = False
+    try:
+        results = hands.process(rgb_frame)
+    finally:
+        rgb_frame.flags.writeable = True
+    if not results.multi_hand_landmarks:
+        return []
+    return [(results.multi_handedness[i].classification[0].label, hl)
+            for i, hl in enumerate(results.multi_hand_landmarks)]
+
+def _track_chunk(video_path, start, end, fps):
+    """Pool worker: detection only (no drawing) over frames [start, end)"""
+    landmarker = get_hand_landmarker() if USE_TASKS_API else None
+    hands = None if USE_TASKS_API else get_hands()
+
+    cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+    if start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    rows = np.empty(max(end - start, 1) * 2, dtype=ROW_DTYPE)
+    n_rows = 0
+    proc_size = inference_size(width, height)
+    if proc_size is not None:
+        small = np.empty((proc_size[1], proc_size[0], 3), dtype=np.uint8)
+        rgb_frame = np.empty_like(small)
+    else:
+        small = None
+        rgb_frame = np.empty((height, width, 3), dtype=np.uint8)
+
+    # Nothing here outlives one iteration, so a single decode buffer is
+    # reused for every frame via grab()/retrieve()
+    frame_buf = np.empty((height, width, 3), dtype=np.uint8)
+    frame_idx = start
+    while frame_idx < end:
+        if not cap.grab():
+            break
+        ret, frame = cap.retrieve(frame_buf)
+        if not ret:
+            break
+        frame_idx += 1
+        if small is not None:
+            cv2.resize(frame, proc_size, dst=small, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+        else:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+        for handedness, hand_landmarks in detect_hands_in_frame(rgb_frame, frame_idx, fps,
+                                                                landmarker, hands):
+            wrist = hand_landmarks.landmark[0]
+            if n_rows == rows.shape[0]:
+                rows = np.concatenate([rows, np.empty(rows.shape[0], dtype=ROW_DTYPE)])
+            rows[n_rows] = (frame_idx,
+                            HAND_RIGHT if handedness == "Right" else HAND_LEFT,
+                            wrist.x, wrist.y, wrist.z,
+                            NUM_LANDMARKS)
+            n_rows += 1
+
+    cap.release()
+    if landmarker is not None:
+        landmarker.close()
+    return rows[:n_rows]
+
+def track_video_parallel(video_path):
+    """CSV-only tracking split into frame ranges across worker processes.
+
+    Used when no annotated output is needed: each worker decodes and
+    infers its own slice of the video, so long clips scale with cores.
+    Falls back to the serial path inside pool workers (which may not
+    spawn children) or when the video is too short to split.
+    """
+    meta = cv2.VideoCapture(video_path)
+    fps = meta.get(cv2.CAP_PROP_FPS)
+    width = int(meta.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(meta.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    total_frames = int(meta.get(cv2.CAP_PROP_FRAME_COUNT))
+    duration_sec = total_frames / fps
+    meta.release()
+
+    workers = min(os.cpu_count() or 1, max(total_frames // 300, 1))
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        return track_video(video_path, annotate=False)
+
+    bounds = np.linspace(0, total_frames, workers + 1).astype(int)
+    chunks = [(video_path, int(s), int(e), fps)
+              for s, e in zip(bounds[:-1], bounds[1:]) if e > s]
+    console.print(f"[bold green]Processing video with hand tracking ({len(chunks)} parallel chunks)...[/bold green]")
+    with multiprocessing.Pool(processes=len(chunks), initializer=_reset_detectors) as pool:
+        parts = pool.starmap(_track_chunk, chunks)
+
+    rows = np.concatenate(parts) if parts else np.empty(0, dtype=ROW_DTYPE)
+    console.print("[bold green]Hand tracking complete![/bold green]")
+    return rows, fps, width, height, duration_sec, None
+
+def track_video(video_path, annotate=True):
+    """Run hand tracking over one video, writing the annotated copy.
+
+    With annotate=False the drawing and encoding work is skipped and the
+    returned tracked_path is None.
+
+    Returns (rows, fps, width, height, duration_sec, tracked_path).
+    """
+    landmarker = get_hand_landmarker() if USE_TASKS_API else None
+    hands = None if USE_TASKS_API else get_hands()
+
+    # Probe the container with OpenCV (cheap, header-only), then open the
+    # actual decode path, which may be NVDEC-backed
+    meta = cv2.VideoCapture(video_path)
+    fps = meta.get(cv2.CAP_PROP_FPS)
+    width = int(meta.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(meta.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    total_frames = int(meta.get(cv2.CAP_PROP_FRAME_COUNT))
+    duration_sec = total_frames / fps
+    meta.release()
+
+    # Decode on a background thread so reads overlap with inference
+    reader = FrameReader(open_video_capture(video_path))
+
+    if annotate:
+        # Annotated frames stream into ffmpeg as raw BGR and get encoded
+        # once with the final codec while the source audio is muxed in,
+        # instead of an mp4v temp file followed by a second encode pass
+        tracked_path = os.path.join(tracked_folder, f"tracked_{os.path.basename(video_path)}")
+        # '1:a:0?' keeps the audio map optional: sources with no audio
+        # stream (screen recordings) would otherwise kill ffmpeg outright.
+        # stderr is captured (errors only, no stats spam) so a failed
+        # encode can be reported instead of silently discarded
+        encoder = subprocess.Popen(
+            [ffmpeg_path, "-y", "-hide_banner", "-loglevel", "error", "-nostats",
+             "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}",
+             "-r", str(fps), "-i", "-",
+             "-i", video_path]
+            + video_encoder_args +
+            ["-c:a", "aac", "-map", "0:v:0", "-map", "1:a:0?", tracked_path],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    else:
+        tracked_path = None
+        encoder = None
+
+    # Detections land in a preallocated structured array (sized for the
+    # worst case of max_num_hands per frame) instead of one Python dict
+    # per row; the frame count from the header is only an estimate, so
+    # the buffer still doubles if it ever fills up
+    rows = np.empty(max(total_frames, 1) * 2, dtype=ROW_DTYPE)
+    n_rows = 0
+
+    # Reusable buffers: resize/cvtColor write into them in place instead of
+    # allocating fresh frame-sized arrays every iteration. Inference runs
+    # on a downscaled copy when the source is wide; drawing stays full-res
+    proc_size = inference_size(width, height)
+    if proc_size is not None:
+        small = np.empty((proc_size[1], proc_size[0], 3), dtype=np.uint8)
+        rgb_frame = np.empty_like(small)
+    else:
+        small = None
+        rgb_frame = np.empty((height, width, 3), dtype=np.uint8)
+
+    console.print("[bold green]Processing video with hand tracking...[/bold green]")
+    try:
+        with Progress() as progress:
+            task = progress.add_task("[cyan]Tracking hands...", total=total_frames)
+            frame_idx = 0
+            while True:
+                frame = reader.read()
+                if frame is None:
+                    break
+                frame_idx += 1
+
+                if small is not None:
+                    cv2.resize(frame, proc_size, dst=small, interpolation=cv2.INTER_AREA)
+                    cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+                else:
+                    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+                detections = detect_hands_in_frame(rgb_frame, frame_idx, fps,
+                                                   landmarker, hands)
+                # Frames with no hands skip straight to the write: the frame
+                # still has to reach the encoder untouched so the output keeps
+                # its frame count and stays in sync with the muxed audio
+                if detections:
+                    for handedness, hand_landmarks in detections:
+                        if annotate:
+                            draw_hand(frame, hand_landmarks, width, height,
+                                      (0, 0, 255) if handedness == "Left" else (255, 0, 0))
+                        wrist = hand_landmarks.landmark[0]
+                        if n_rows == rows.shape[0]:
+                            rows = np.concatenate([rows, np.empty(rows.shape[0], dtype=ROW_DTYPE)])
+                        rows[n_rows] = (frame_idx,
+                                        HAND_RIGHT if handedness == "Right" else HAND_LEFT,
+                                        wrist.x, wrist.y, wrist.z,
+                                        NUM_LANDMARKS)
+                        n_rows += 1
+
+                if encoder is not None:
+                    try:
+                        # ndarrays satisfy the buffer protocol, so the pipe
+                        # write needs no tobytes() copy of the frame
+                        encoder.stdin.write(frame)
+                    except BrokenPipeError:
+                        # ffmpeg died; keep tracking so the CSV and reports
+                        # still come out, the failure is reported below
+                        pass
+                reader.recycle(frame)
+                progress.update(task, advance=1)
+
+    finally:
+        # Runs on the success path and on errors alike, so the decode
+        # thread, the per-video landmarker and the encoder pipe never
+        # outlive the call
+        reader.release()
+        if landmarker is not None:
+            landmarker.close()
+        if encoder is not None:
+            try:
+                encoder.stdin.close()
+            except BrokenPipeError:
+                pass
+            encode_err = encoder.stderr.read().decode(errors="replace").strip()
+            if encoder.wait() != 0:
+                console.print(f"[red]Annotated video encode failed:[/red] {encode_err or 'ffmpeg exited with an error'}")
+                tracked_path = None
+    console.print("[bold green]Hand tracking complete![/bold green]")
+
+    return rows[:n_rows], fps, width, height, duration_sec, tracked_path
+
+def ask_display_choice():
+    """Ask up front how (or whether) to view the result; returns '1'-'3'.
+
+    Prompting before tracking lets the pipeline skip the entire
+    draw/encode path when the answer is 'skip playback'.
+    """
+    while True:
+        display_choice = console.input("\nHow would you like to view the result afterwards?\n[1] Side-by-side (original + tracked)\n[2] Tracked video only\n[3] Skip video playback\nEnter choice (1-3): ").strip()
+        if display_choice in ("1", "2", "3"):
+            return display_choice
+        console.print("[red]Invalid choice. Please enter 1, 2, or 3.[/red]")
+
+def play_tracked_video(output_path, tracked_path, width, height, display_choice):
+    """Play the tracked result with ffplay according to display_choice"""
+    if display_choice == "1":
+        # Play side-by-side with calculated positions
+        console.print("[green]Playing videos side-by-side...[/green]")
+
+        # Calculate window positions for side-by-side display
+        # Get screen dimensions (approximate - adjust if needed)
+        screen_width = 1920  # You can modify this based on your screen
+
+        # Calculate positions to center both videos
+        total_width = width * 2
+        start_x = max(0, (screen_width - total_width) // 2)
+
+        # Left window (original)
+        left_x = start_x
+        left_y = 100  # Some padding from top
+
+        # Right window (tracked)
+        right_x = start_x + width
+        right_y = 100
+
+        p1 = subprocess.Popen([ffplay_path, "-autoexit", "-window_title", f"Original - {os.path.basename(output_path)}",
+                               "-x", str(width), "-y", str(height),
+                               "-left", str(left_x), "-top", str(left_y),
+                               output_path])
+        time.sleep(0.25)
+        p2 = subprocess.Popen([ffplay_path, "-autoexit", "-window_title", f"Tracked - {os.path.basename(tracked_path)}",
+                               "-x", str(width), "-y", str(height),
+                               "-left", str(right_x), "-top", str(right_y),
+                               "-an", tracked_path])
+        p1.wait()
+        p2.wait()
+    elif display_choice == "2":
+        # Play tracked video only
+        console.print("[green]Playing tracked video...[/green]")
+        p = subprocess.Popen([ffplay_path, "-autoexit", "-window_title", f"Tracked - {os.path.basename(tracked_path)}",
+                              "-x", str(width), "-y", str(height), tracked_path])
+        p.wait()
+
+def process_video(output_path, interactive=True, annotate=True):
+    """Full pipeline for one video: track, export CSV, analyse, play back.
+
+    With interactive=False (batch mode) the playback prompt is skipped so
+    the function is safe to run in a worker process. With annotate=False
+    no annotated video is produced at all and tracking runs chunk-parallel
+    across cores where possible.
+    """
+    # --- CSV Setup & delete old files ---
+    base_name = os.path.splitext(os.path.basename(output_path))[0]
+    console.print(f"\n[cyan]Preparing to process:[/cyan] {base_name}")
+
+    # Clean up old CSV and report files for this video
+    clean_old_csv_files(base_name)
+    clean_old_report_files(base_name)
+
+    # --- Ask for the display preference before doing any of the work ---
+    if interactive and annotate:
+        display_choice = ask_display_choice()
+        if display_choice == "3":
+            # The render would only be deleted unwatched, so skip the
+            # drawing and encoding pipeline entirely
+            console.print("[yellow]Skipping annotated video render.[/yellow]")
+            annotate = False
+    else:
+        display_choice = None
+
+    # --- Hand tracking ---
+    if annotate:
+        rows, fps, width, height, duration_sec, tracked_path = track_video(output_path)
+    else:
+        rows, fps, width, height, duration_sec, tracked_path = track_video_parallel(output_path)
+
+    # The decode buffer pool, prefetch queue and encoder pipe are done
+    # with; one collection pass returns that memory before the analysis
+    # phase (the columnar views below alias rows, they don't copy it)
+    gc.collect()
+
+    # --- Write CSV ---
+    csv_file = os.path.join(csv_folder, f"{base_name}_hand_data.csv")
+    csv_columns = ["frame", "hand", "wrist_x", "wrist_y", "wrist_z", "num_landmarks"]
+    hand_names = np.array(["Left", "Right"])
+    # 1 MB buffer: a handful of large write syscalls instead of one per 8 KB
+    with open(csv_file, "w", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(csv_columns)
+        # Columns convert to Python values in bulk; the on-disk format
+        # (including 'Left'/'Right' labels) is unchanged
+        writer.writerows(zip(rows['frame'].tolist(), hand_names[rows['hand']].tolist(),
+                             rows['wrist_x'].tolist(), rows['wrist_y'].tolist(),
+                             rows['wrist_z'].tolist(), rows['num_landmarks'].tolist()))
+    console.print(f"[green]CSV saved:[/green] {csv_file}")
+
+    # --- Generate Analysis Features ---
+    console.print("\n[bold cyan]Generating analysis features...[/bold cyan]")
+
+    # Expose tracking rows as columnar arrays once for all analysis functions
+    cols = columnarize(rows)
+
+    # 1. ASCII Heatmap (CLI display)
+    create_ascii_heatmap(cols, width, height, base_name)
+
+    # 2. 3D Trajectory Visualization (HTML file)
+    create_3d_trajectory(cols, base_name)
+
+    # 3. Tracking Report (CLI display + text file)
+    generate_tracking_report(cols, base_name, fps, duration_sec)
+
+    if tracked_path is not None:
+        console.print("\n[bold cyan]Video processing complete![/bold cyan]")
+        if interactive:
+            play_tracked_video(output_path, tracked_path, width, height, display_choice)
+
+        # --- Delete tracked video ---
+        try:
+            os.remove(tracked_path)
+            console.print(f"[green]Deleted tracked file:[/green] {tracked_path}")
+        except PermissionError:
+            console.print(f"[red]Could not delete:[/red] {tracked_path}")
+        except FileNotFoundError:
+            console.print(f"[yellow]Tracked file already removed:[/yellow] {tracked_path}")
+    else:
+        console.print("\n[bold cyan]Video processing complete![/bold cyan]")
+
+    console.print("\n[bold green]Process completed successfully![/bold green]")
+    console.print(f"[cyan]Files generated:[/cyan]")
+    console.print(f"  • CSV Data: {csv_file}")
+    console.print(f"  • 3D Trajectory: {os.path.join(reports_folder, f'{base_name}_3d_trajectory.html')}")
+    console.print(f"  • Analysis Report: {os.path.join(reports_folder, f'{base_name}_tracking_report.txt')}")
+
+def run_batch():
+    """Process every video in the videos folder across CPU cores"""
+    videos = list_existing_videos()
+    if not videos:
+        console.print("[red]No videos found to batch process.[/red]")
+        return
+
+    paths = [e.path for e in videos]
+    workers = min(os.cpu_count() or 1, len(paths))
+    console.print(f"[green]Batch processing {len(paths)} video(s) on {workers} worker(s)...[/green]")
+    with multiprocessing.Pool(processes=workers, initializer=_reset_detectors) as pool:
+        # Batch mode never plays the tracked video back, so skip the
+        # annotated render entirely (annotate=False)
+        pool.starmap(process_video, [(p, False, False) for p in paths])
+    console.print("\n[bold green]Batch processing complete![/bold green]")
+
+def main():
+    show_splash(animate="--splash" in sys.argv)
+    # Load the hand model up front so the first video starts instantly
+    # (the Tasks-API landmarker is per-video, so nothing to warm there)
+    if not USE_TASKS_API:
+        get_hands()
+
+    selection = select_video()
+    if selection == "batch":
+        run_batch()
+    else:
+        process_video(selection)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file